@@ -0,0 +1,37 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# --- Asset Registry --------------------------------------------------------------------------------------------
+# raw_asset -> token symbol mapping, kept as data in data/asset_registry.json instead of a CASE block in SQL.
+# Exact matches come from "symbols"; "prefixes" are matched case-insensitively for assets such as factory denoms.
+# Bump "version" whenever the mapping changes. Aggregates are keyed on raw_asset, so the mapping is applied to
+# each distinct raw_asset once and a registry edit never requires refetching data.
+REGISTRY_PATH = Path(__file__).resolve().parent.parent / "data" / "asset_registry.json"
+
+
+@lru_cache(maxsize=None)
+def load_registry(path=REGISTRY_PATH):
+    registry = json.loads(Path(path).read_text(encoding="utf-8"))
+    prefixes = {prefix.lower(): symbol for prefix, symbol in registry.get("prefixes", {}).items()}
+    return registry["version"], registry["symbols"], prefixes
+
+
+def _map_unique(raw_asset, symbols, prefixes):
+    symbol = raw_asset.map(symbols)
+    lowered = raw_asset.str.lower()
+    for prefix, prefix_symbol in prefixes.items():
+        symbol = symbol.mask(symbol.isna() & lowered.str.startswith(prefix, na=False), prefix_symbol)
+    return symbol.fillna(raw_asset)
+
+
+def map_token_symbol(raw_asset):
+    """Map a Series of raw_asset values to symbols; unknown assets keep their raw name, NULLs stay NULL."""
+    _, symbols, prefixes = load_registry()
+    codes, uniques = pd.factorize(raw_asset)
+    mapped = _map_unique(pd.Series(uniques, dtype=object), symbols, prefixes).to_numpy(dtype=object)
+    out = np.where(codes >= 0, mapped[codes] if len(mapped) else None, None)
+    return pd.Series(out, index=raw_asset.index, name=raw_asset.name, dtype=object)
@@ -0,0 +1,244 @@
+import argparse
+import atexit
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# The benchmark always runs on the offline backend with a throwaway daily store and no shared result cache, so
+# every stage does its real work. These settings are read when the utils modules are imported, so they are set
+# before those imports. The store directory is removed again when the benchmark exits.
+STORE_DIR = tempfile.mkdtemp(prefix="axelar-bench-store-")
+atexit.register(shutil.rmtree, STORE_DIR, ignore_errors=True)
+os.environ["AXELAR_BACKEND"] = "duckdb"
+os.environ["AXELAR_STORE_DIR"] = STORE_DIR  # reset_caches wipes STORE_ROOT
+os.environ.setdefault("AXELAR_RESULT_CACHE_MB", "0")
+os.environ.setdefault("STREAMLIT_LOGGER_LEVEL", "error")
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from utils import bridging, satellite  # noqa: E402
+from utils.formatting import show_table  # noqa: E402
+from utils.offline import DuckDBBackend, synthetic_tables, write_tables  # noqa: E402
+from utils.sections import OPENED_KEY  # noqa: E402
+from utils.store import STORE_ROOT  # noqa: E402
+
+# --- Benchmark Harness -----------------------------------------------------------------------------------------
+# Runs each page's data and render pipeline headlessly against synthetic fixtures at BASE_ROWS x scale and reports
+# wall time, peak traced memory and rows/sec per stage. Peak memory comes from tracemalloc, which sees Python and
+# NumPy allocations but not DuckDB or Arrow buffers, and is taken on a separate run so tracing does not skew the
+# timings. `--save-baseline` records the results; later runs compare against them and exit non-zero when a stage
+# gets slower than the tolerance allows. Page renders run with every lazy section already opened, so they time the
+# whole page rather than just the sections open by default.
+#
+#   python -m utils.benchmark --scales 1,10,100
+BASE_ROWS = 50_000
+START_DATE, END_DATE = "2025-01-01", "2025-06-30"
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = {
+    "page1": ROOT / "pages" / "1_🚀Axelar_Bridging_Blockchain.py",
+    "page2": ROOT / "pages" / "2_💸Satellite_Platform.py",
+}
+SECTIONS = {"source", "destination", "path", "token", "flows"}  # page 1's lazy_section keys
+BENCH_DIR = Path(os.environ.get("AXELAR_BENCH_DIR", ".offline/bench"))
+
+
+def fixture_dir(scale, seed=0):
+    """Synthetic tables for `scale`, generated once and reused while rows and seed stay the same."""
+    path = BENCH_DIR / f"x{scale}"
+    manifest = {"rows": BASE_ROWS * scale, "start": START_DATE, "end": END_DATE, "seed": seed}
+    manifest_path = path / "manifest.json"
+    if not manifest_path.exists() or json.loads(manifest_path.read_text()) != manifest:
+        write_tables(synthetic_tables(manifest["rows"], START_DATE, END_DATE, seed), path)
+        manifest_path.write_text(json.dumps(manifest))
+    return path
+
+
+def measure(fn, memory=True):
+    start = time.perf_counter()
+    result = fn()
+    wall = time.perf_counter() - start
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, wall, peak
+
+
+def reset_caches():
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    shutil.rmtree(STORE_ROOT, ignore_errors=True)
+
+
+def _run_page(path):
+    at = AppTest.from_file(str(path), default_timeout=600)
+    at.session_state[OPENED_KEY] = set(SECTIONS)
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"{path.name} raised: {at.exception[0].value}")
+    return at
+
+
+# --- Stages ----------------------------------------------------------------------------------------------------
+# Each stage is (name, fn, rows) where rows is the number of input rows the stage processes.
+def page1_stages(pool):
+    state = {}
+
+    def fetch():
+        state["fact"] = bridging.read_fact_data(pool, START_DATE, END_DATE)
+        return state["fact"]
+
+    def daily():
+        state["daily"] = bridging.to_daily(state["fact"])
+        return state["daily"]
+
+    def users():
+        state["users"] = bridging.to_daily_users(state["fact"])
+        return state["users"]
+
+    def sketches():
+        state["sketches"] = bridging.to_user_sketches(state["fact"])
+        return state["sketches"]
+
+    def rollups(exact):
+        def run():
+            users = (state["users"], None) if exact else (None, state["sketches"])
+            state["tables"] = [
+                bridging.get_source_chain_data(state["daily"], *users),
+                bridging.get_destination_chain_data(state["daily"], *users),
+                bridging.get_path_chain_data(state["daily"], *users),
+                bridging.get_token_data(state["daily"], *users),
+            ]
+            return state["tables"]
+        return run
+
+    def tables():
+        for df in state["tables"]:
+            show_table(df)
+
+    yield "page1.fetch_fact", fetch, None
+    yield "page1.to_daily", daily, lambda: len(state["fact"])
+    yield "page1.to_daily_users", users, lambda: len(state["fact"])
+    yield "page1.to_user_sketches", sketches, lambda: len(state["fact"])
+    yield "page1.rollups_approx", rollups(False), lambda: len(state["daily"])
+    yield "page1.rollups_exact", rollups(True), lambda: len(state["daily"])
+    yield "page1.show_tables", tables, lambda: sum(len(df) for df in state["tables"])
+
+
+def page2_stages(pool):
+    state = {}
+
+    def fetch():
+        state["base"] = satellite.fetch_satellite_days(pool, START_DATE, END_DATE)
+        return state["base"]["daily"]
+
+    def rollups(exact):
+        def run():
+            daily = state["base"]["daily"]
+            users = (state["base"]["daily_users"], None) if exact else (None, state["base"]["user_sketches"])
+            return [
+                satellite.get_kpis(daily, *users),
+                *(satellite.resample_ts(daily, *users, timeframe) for timeframe in satellite.TIMEFRAMES),
+                satellite.get_breakdown(daily, *users, "source_chain", "Source Chain"),
+                satellite.get_breakdown(daily, *users, "destination_chain", "Destination Chain"),
+                satellite.get_breakdown(daily, *users, "token_symbol", "Token"),
+            ]
+        return run
+
+    yield "page2.fetch_base", fetch, None
+    yield "page2.rollups_approx", rollups(False), lambda: len(state["base"]["daily"])
+    yield "page2.rollups_exact", rollups(True), lambda: len(state["base"]["daily"])
+
+
+def run_scale(scale, memory=True):
+    os.environ["AXELAR_OFFLINE_DIR"] = str(fixture_dir(scale))
+    reset_caches()
+    pool, setup, _ = measure(DuckDBBackend, memory=False)
+    fact_rows = BASE_ROWS * scale
+    results = [{"stage": "backend.setup", "rows": fact_rows, "wall_s": setup, "peak_mb": None}]
+
+    for stages in (page1_stages(pool), page2_stages(pool)):
+        for name, fn, rows in stages:
+            out, wall, peak = measure(fn, memory)
+            n = rows() if rows else len(out)
+            results.append({"stage": name, "rows": n, "wall_s": wall, "peak_mb": peak and peak / 2 ** 20})
+
+    # End to end: a cold page run (empty caches and store) and a warm rerun served from them.
+    for name, path in PAGES.items():
+        reset_caches()
+        _, cold, _ = measure(lambda: _run_page(path), memory=False)
+        _, warm, _ = measure(lambda: _run_page(path), memory=False)
+        results.append({"stage": f"{name}.render_cold", "rows": fact_rows, "wall_s": cold, "peak_mb": None})
+        results.append({"stage": f"{name}.render_warm", "rows": fact_rows, "wall_s": warm, "peak_mb": None})
+
+    for result in results:
+        result["scale"] = scale
+        result["rows_per_s"] = result["rows"] / result["wall_s"] if result["wall_s"] else None
+    return results
+
+
+# --- Reporting -------------------------------------------------------------------------------------------------
+def compare(results, baseline, tolerance, min_delta=0.05):
+    """Attach the ratio to the baseline wall time and flag stages slower than 1 + tolerance by at least min_delta s."""
+    previous = {(r["scale"], r["stage"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        base = previous.get((result["scale"], result["stage"]))
+        result["vs_baseline"] = result["wall_s"] / base["wall_s"] if base and base["wall_s"] else None
+        if (result["vs_baseline"] and result["vs_baseline"] > 1 + tolerance
+                and result["wall_s"] - base["wall_s"] >= min_delta):
+            regressions.append(result)
+    return regressions
+
+
+def print_report(results):
+    print(f"{'scale':>5}  {'stage':<24} {'rows':>11} {'wall_s':>9} {'peak_mb':>9} {'rows/s':>12} {'vs base':>8}")
+    for r in results:
+        peak = f"{r['peak_mb']:9.1f}" if r["peak_mb"] is not None else f"{'-':>9}"
+        rate = f"{r['rows_per_s']:12,.0f}" if r["rows_per_s"] is not None else f"{'-':>12}"
+        ratio = f"{r['vs_baseline']:7.2f}x" if r.get("vs_baseline") else f"{'-':>8}"
+        print(f"{r['scale']:>4}x  {r['stage']:<24} {r['rows']:>11,} {r['wall_s']:9.3f} {peak} {rate} {ratio}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard loaders and render pipeline offline.")
+    parser.add_argument("--scales", default="1,10", help="comma-separated multiples of BASE_ROWS, e.g. 1,10,100")
+    parser.add_argument("--baseline", default=str(BENCH_DIR / "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before a stage is flagged")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="ignore slowdowns shorter than this (s)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced run used for peak memory")
+    args = parser.parse_args()
+
+    results = []
+    for scale in (int(s) for s in args.scales.split(",")):
+        results.extend(run_scale(scale, memory=not args.no_memory))
+
+    baseline_path = Path(args.baseline)
+    regressions = []
+    if baseline_path.exists() and not args.save_baseline:
+        regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance, args.min_delta)
+    print_report(results)
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=1))
+        print(f"Saved baseline to {baseline_path}")
+    elif regressions:
+        print(f"{len(regressions)} stage(s) slower than baseline by more than {args.tolerance:.0%}:")
+        for r in regressions:
+            print(f"  {r['scale']}x {r['stage']}: {r['vs_baseline']:.2f}x")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
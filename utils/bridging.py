@@ -0,0 +1,325 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.assets import map_token_symbol
+from utils.codes import NULL_CODE, decode_pairs, pair_codes
+from utils.connection import BACKEND, pin_dtypes, run_query
+from utils.flows import build_flow_matrix
+from utils.normalize import NORMALIZED_TABLE, normalized_table, service_source_sql
+from utils.queries import register
+from utils.sketch import build_sketches, estimate_distinct
+from utils.store import DailyStore
+from utils.tracing import annotate, traced, traced_loader
+
+# --- Fact Query ------------------------------------------------------------------------------------------------
+FACT_COLUMNS = [
+    "created_at", "id", "user", "source_chain", "destination_chain",
+    "service", "amount_usd", "fee", "raw_asset",
+]
+FACT_DTYPES = {
+    "source_chain": "category",
+    "destination_chain": "category",
+    "service": "category",
+    "raw_asset": "category",
+    "amount_usd": "float64",
+    "fee": "float64",
+}
+
+
+# Half-open [since, until) bounds on the raw column keep the predicate sargable, so Snowflake can prune
+# micro-partitions in each branch before any VARIANT parsing happens.
+def date_bounds(start_date, end_date):
+    since = pd.Timestamp(start_date).normalize()
+    return {"since": since, "until": pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)}
+
+
+@register("bridging.fact", since="timestamp", until="timestamp")
+def fact_query(table=NORMALIZED_TABLE):
+    in_range = "created_at >= %(since)s::timestamp AND created_at < %(until)s::timestamp"
+    return f"""
+WITH axelar_service AS (
+{service_source_sql(in_range, table)}
+    )
+
+SELECT created_at, id, user, source_chain, destination_chain,
+     service, amount_usd, fee, raw_asset
+FROM axelar_service
+    """
+
+
+def read_fact_data(pool, start_date, end_date):
+    query = fact_query.bind(date_bounds(start_date, end_date), table=normalized_table(pool))
+    df = run_query(pool, query)
+    df.columns = df.columns.str.lower()
+    return pin_dtypes(df[FACT_COLUMNS], FACT_DTYPES)
+
+
+# --- Daily Aggregates ------------------------------------------------------------------------------------------
+# One row per (day, source_chain, destination_chain, service, raw_asset). raw_asset is kept instead of the mapped
+# symbol so the token-count columns stay exact; symbols are applied after rollup. Distinct users cannot be summed
+# across days, so for exact mode a long table holds each distinct (day, source_chain, destination_chain, raw_asset,
+# user) once, and for approximate mode a companion table holds per-day HyperLogLog sketches of senders per source
+# chain, destination chain, path and raw_asset. Transfer ids are unique per row of the union, so per-day transfer
+# counts add up exactly and need no sketch. Chains and assets are stored as int16 codes from the store's "chain" and
+# "asset" dictionaries (utils/codes.py), paths as packed int32 chain pairs; names are decoded only when a rollup is
+# labelled for display.
+DAILY_KEYS = ["day", "source_chain", "destination_chain", "service", "raw_asset"]
+DAILY_SCHEMA = {
+    "day": "datetime64[ns]", "source_chain": "int16", "destination_chain": "int16", "service": "category",
+    "raw_asset": "int16", "transfers": "int64", "volume_usd": "float64", "volume_count": "int64",
+    "fee_usd": "float64", "fee_count": "int64",
+}
+USERS_SCHEMA = {
+    "day": "datetime64[ns]", "source_chain": "int16", "destination_chain": "int16", "raw_asset": "int16", "user": "str",
+}
+SKETCH_SCHEMA = {"day": "datetime64[ns]", "dimension": "str", "key": "int32", "registers": "object"}
+DAILY_COLUMNS = list(DAILY_SCHEMA)
+USERS_COLUMNS = list(USERS_SCHEMA)
+SKETCH_COLUMNS = list(SKETCH_SCHEMA)
+SKETCH_DIMENSIONS = ["source_chain", "destination_chain", "path", "raw_asset"]
+CODED_COLUMNS = {"source_chain": "chain", "destination_chain": "chain", "raw_asset": "asset"}
+STORE_VERSION = 3
+
+
+def encode_names(df):
+    store = get_daily_store()
+    return df.assign(**{col: store.codes(name).encode(df[col]) for col, name in CODED_COLUMNS.items()})
+
+
+def _with_path(df):
+    return df.assign(path=pair_codes(df["source_chain"], df["destination_chain"]))
+
+
+def to_daily(df_fact):
+    df = encode_names(df_fact).assign(day=pd.to_datetime(df_fact["created_at"]).dt.normalize())
+    grouped = df.groupby(DAILY_KEYS, dropna=False, observed=True, sort=False)
+    out = pd.DataFrame({
+        "transfers": grouped["id"].nunique(),
+        "volume_usd": grouped["amount_usd"].sum(min_count=1),
+        "volume_count": grouped["amount_usd"].count(),
+        "fee_usd": grouped["fee"].sum(min_count=1),
+        "fee_count": grouped["fee"].count(),
+    }).reset_index()
+    return out[DAILY_COLUMNS]
+
+
+def to_daily_users(df_fact):
+    df = encode_names(df_fact).assign(day=pd.to_datetime(df_fact["created_at"]).dt.normalize())
+    return df[USERS_COLUMNS].dropna(subset=["user"]).drop_duplicates(ignore_index=True).astype({"user": "str"})
+
+
+def to_user_sketches(df_fact):
+    df = _with_path(encode_names(df_fact).assign(day=pd.to_datetime(df_fact["created_at"]).dt.normalize()))
+    frames = []
+    for dimension in SKETCH_DIMENSIONS:
+        sketches = build_sketches(df[df[dimension] >= 0], ["day", dimension], "user")
+        frames.append(sketches.rename(columns={dimension: "key"}).assign(dimension=dimension))
+    out = pd.concat(frames, ignore_index=True)[SKETCH_COLUMNS]
+    return out.astype({"key": "int32"})
+
+
+def fetch_daily_data(pool, start_date, end_date):
+    df_fact = read_fact_data(pool, start_date, end_date)
+    return {
+        "daily": to_daily(df_fact),
+        "daily_users": to_daily_users(df_fact),
+        "user_sketches": to_user_sketches(df_fact),
+    }
+
+
+@st.cache_resource
+def get_daily_store():
+    name = "bridging" if BACKEND == "snowflake" else f"bridging-{BACKEND}"  # keep offline data out of the real store
+    tables = {"daily": DAILY_SCHEMA, "daily_users": USERS_SCHEMA, "user_sketches": SKETCH_SCHEMA}
+    return DailyStore(name, fetch_daily_data, tables, version=STORE_VERSION)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _read_daily_data(start_date, end_date, exact, generation):
+    # Keyed on the store generation, so widget reruns reuse the frames and any store change reads them afresh.
+    store = get_daily_store()
+    df_daily = store.read("daily", start_date, end_date)
+    if exact:
+        return df_daily, store.read("daily_users", start_date, end_date), None
+    return df_daily, None, store.read("user_sketches", start_date, end_date)
+
+
+@traced_loader
+def get_daily_data(pool, start_date, end_date, exact=True):
+    """The (daily, daily_users, user_sketches) tables for the range, and the store generation they were read at.
+
+    Only the users table of the mode is read; the other is None."""
+    store = get_daily_store()
+    annotate(cache_hit=not store.ensure(pool, start_date, end_date))
+    generation = store.generation()  # taken before reading, so a refresh landing mid-read shows up as a new one
+    return *_read_daily_data(start_date, end_date, exact, generation), generation
+
+
+# --- Local Rollups ---------------------------------------------------------------------------------------------
+# Mirrors the SQL aggregates: count(distinct ...) ignores NULLs, sum/avg of an all-NULL group stays NULL.
+# Each rollup counts distinct users exactly from the daily users table, or estimates them from the user sketches
+# when those are given instead. Keys are integer codes (NULL = -1) and `decode` turns the grouped codes back into
+# display labels.
+def _distinct_users(df_users, key):
+    return df_users[df_users[key] >= 0].groupby(key, sort=False)["user"].nunique()
+
+
+def _sketched_users(df_sketches, dimension, relabel=None):
+    df = df_sketches[df_sketches["dimension"] == dimension]
+    if relabel is not None:
+        df = df.assign(key=relabel(df["key"].to_numpy()))
+    return estimate_distinct(df, "key")
+
+
+def _distinct_codes(df, key, column):
+    return df[df[column] >= 0].groupby(key, sort=False)[column].nunique()
+
+
+def _rollup(df, key, label, extra, decode, users, code_column=None):
+    df = df[df[key] >= 0]
+    grouped = df.groupby(key, sort=False)
+    volume = grouped["volume_usd"].sum(min_count=1)
+    fees = grouped["fee_usd"].sum(min_count=1)
+    out = pd.DataFrame({
+        "🚀Transfers": grouped["transfers"].sum(),
+        "💸Volume($)": volume.round(1),
+        "📊Avg Volume($)": (volume / grouped["volume_count"].sum().replace(0, np.nan)).round(1),
+        "⛽Fees($)": fees.round(1),
+        "💨Avg Fee($)": (fees / grouped["fee_count"].sum().replace(0, np.nan)).round(5),
+    })
+    out.insert(1, "👥Users", users.reindex(out.index).fillna(0).astype("int64"))
+    for name, column in extra.items():
+        if callable(column):
+            out[name] = column(out)
+        else:
+            out[name] = _distinct_codes(df, key, column).reindex(out.index, fill_value=0)
+    out = out.sort_values("🚀Transfers", ascending=False, kind="stable")
+    if code_column is not None:
+        out[code_column] = out.index.to_numpy()
+    out.index = decode(out.index.to_numpy())
+    return out.rename_axis(label).reset_index()
+
+
+def _chain_names(codes):
+    return get_daily_store().codes("chain").decode(codes)
+
+
+@traced("transform")
+def get_source_chain_data(df_daily, df_users=None, df_sketches=None):
+    if df_sketches is None:
+        users = _distinct_users(df_users, "source_chain")
+    else:
+        users = _sketched_users(df_sketches, "source_chain")
+    return _rollup(df_daily, "source_chain", "📤Source Chain", {
+        "📥#Dest Chains": "destination_chain",
+        "💎#Tokens": "raw_asset",
+    }, _chain_names, users)
+
+
+@traced("transform")
+def get_destination_chain_data(df_daily, df_users=None, df_sketches=None):
+    if df_sketches is None:
+        users = _distinct_users(df_users, "destination_chain")
+    else:
+        users = _sketched_users(df_sketches, "destination_chain")
+    return _rollup(df_daily, "destination_chain", "📥Destination Chain", {
+        "📤#Source Chains": "source_chain",
+        "💎#Tokens": "raw_asset",
+    }, _chain_names, users)
+
+
+def _txn_per_user(out):
+    users = out["👥Users"].replace(0, np.nan)
+    return (out["🚀Transfers"] / users).round()
+
+
+def _path_labels(pairs):
+    return decode_pairs(get_daily_store().codes("chain"), pairs)
+
+
+def _path_rollup(df_daily, df_users=None, df_sketches=None, tail_label=None):
+    # Each path keeps its packed code in a trailing "path" column. With `tail_label` every path is folded into a
+    # single row carrying that label instead, and there is no code to keep.
+    with_path, relabel, decode, code_column = _with_path, None, _path_labels, "path"
+    if tail_label is not None:
+        def with_path(df):
+            return df.assign(path=np.zeros(len(df), dtype=np.int32))
+
+        def relabel(pairs):
+            return np.zeros(len(pairs), dtype=np.int32)
+
+        def decode(pairs):
+            return np.full(len(pairs), tail_label, dtype=object)
+        code_column = None
+    if df_sketches is None:
+        users = _distinct_users(with_path(df_users), "path")
+    else:
+        users = _sketched_users(df_sketches, "path", relabel)
+    return _rollup(with_path(df_daily), "path", "🔀Path", {
+        "📋Txn/User": _txn_per_user,
+        "💎#Tokens": "raw_asset",
+    }, decode, users, code_column)
+
+
+@traced("transform")
+def get_path_chain_data(df_daily, df_users=None, df_sketches=None):
+    return _path_rollup(df_daily, df_users, df_sketches)
+
+
+# --- Paged Path Table ------------------------------------------------------------------------------------------
+# Paths grow with chains², so the page only sends the visible slice of the full rollup to the browser. Paths past
+# the slice can be folded into one long-tail row; it is re-rolled from the daily rows (or sketches) so its user
+# count stays a distinct count rather than a sum, and its paths are picked by the codes kept in the rollup. KPIs keep
+# reading the full rollup, which never leaves the server.
+PATH_SORT_COLUMNS = ["🚀Transfers", "👥Users", "💸Volume($)", "⛽Fees($)", "📋Txn/User", "💎#Tokens"]
+
+
+def _long_tail(df_daily, df_users, df_sketches, tail):
+    df = df_daily[np.isin(_with_path(df_daily)["path"], tail)]
+    if df_users is not None:
+        df_users = df_users[np.isin(_with_path(df_users)["path"], tail)]
+    if df_sketches is not None:
+        df_sketches = df_sketches[(df_sketches["dimension"] == "path") & df_sketches["key"].isin(tail)]
+    return _path_rollup(df, df_users, df_sketches, tail_label=f"Other ({len(tail):,} paths)")
+
+
+@traced("transform")
+def get_path_page(df_daily, paths, df_users=None, df_sketches=None, sort_by="🚀Transfers", offset=0, limit=25,
+                  tail=False):
+    """Return `limit` paths from `offset` ordered by `sort_by`, optionally plus a long-tail row for the rest.
+
+    `paths` is the TopIndex (utils/ranking.py) of the full path rollup, so paging never re-sorts it. The rows come
+    back without the rollup's "path" code column, ready to show."""
+    ordered = paths.df.iloc[paths.order(sort_by, nulls=True)]
+    visible = ordered.iloc[offset:offset + limit].drop(columns="path")
+    rest = ordered["path"].iloc[offset + limit:].to_numpy()
+    if tail and len(rest):
+        visible = pd.concat([visible, _long_tail(df_daily, df_users, df_sketches, rest)])
+    return visible.reset_index(drop=True)
+
+
+@traced("transform")
+def get_flow_matrix(df_daily):
+    return build_flow_matrix(df_daily, list(get_daily_store().codes("chain").sync()))  # covers every stored code
+
+
+def _symbol_lookup():
+    """Per asset code, the code of its token symbol, plus the symbol names; the trailing -1 serves NULL assets."""
+    assets = get_daily_store().codes("asset").sync()  # another process may have added assets since we last looked
+    symbol_codes, symbols = pd.factorize(map_token_symbol(pd.Series(assets, dtype=object)))
+    return np.append(symbol_codes, NULL_CODE).astype(np.int32), np.asarray(symbols, dtype=object)
+
+
+@traced("transform")
+def get_token_data(df_daily, df_users=None, df_sketches=None):
+    lookup, symbols = _symbol_lookup()
+    if df_sketches is None:
+        users = _distinct_users(df_users.assign(symbol=lookup.take(df_users["raw_asset"].to_numpy())), "symbol")
+    else:
+        users = _sketched_users(df_sketches, "raw_asset", lookup.take)
+    df = df_daily.assign(symbol=lookup.take(df_daily["raw_asset"].to_numpy()))
+    return _rollup(df, "symbol", "💎Token", {
+        "📤#Source Chains": "source_chain",
+        "📥#Destination Chains": "destination_chain",
+    }, symbols.take, users)
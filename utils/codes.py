@@ -0,0 +1,111 @@
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.locks import file_lock
+
+# --- Code Dictionaries -----------------------------------------------------------------------------------------
+# Chain and asset names are stored as small integer codes; the name <-> code mapping lives next to the data it
+# encodes and only ever grows, so codes written earlier stay valid. NULL is code -1 (pd.Categorical's convention),
+# which lets decode() build categoricals straight from the stored codes without touching the strings again.
+# Several Streamlit processes can share one store, so new names are appended under a file lock after re-reading the
+# file, and names another process added are picked up when a lookup or decode meets them.
+MAX_CODES = np.iinfo(np.int16).max + 1
+NULL_CODE = -1
+
+
+class CodeDictionary:
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.names = self._load()
+        self._codes = {name: code for code, name in enumerate(self.names)}
+
+    def _load(self):
+        return json.loads(self.path.read_text()) if self.path.exists() else []
+
+    def _reload(self):
+        # Names past ours were added by another process; a file that no longer starts with our names belongs to a
+        # reset store. Either way the file is the truth, and it is swapped in whole so readers never see it half-built.
+        names = self._load()
+        if names != self.names:
+            self._codes = {name: code for code, name in enumerate(names)}
+            self.names = names
+
+    def sync(self):
+        """The names, re-read first so codes added by other processes are included; size code lookups from this."""
+        with self._lock:
+            self._reload()
+        return self.names
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.names))
+        tmp.replace(self.path)
+
+    def _map(self, values):
+        # Work on the distinct values only; categoricals factorize straight from their existing codes.
+        codes, uniques = pd.factorize(pd.Series(values))
+        mapped = np.array([self._codes.get(name, NULL_CODE) for name in uniques] + [NULL_CODE], dtype=np.int16)
+        return mapped[codes], uniques
+
+    def lookup(self, values):
+        """Codes for `values` without adding new names; unknown names and NULLs map to NULL_CODE."""
+        codes, uniques = self._map(values)
+        if all(name in self._codes for name in uniques):
+            return codes
+        with self._lock:
+            self._reload()
+        return self._map(values)[0]
+
+    def encode(self, values):
+        """int16 codes for `values`, adding names not seen before."""
+        codes, uniques = self._map(values)
+        if all(name in self._codes for name in uniques):
+            return codes
+        with file_lock(self.path.with_suffix(".lock"), self._lock):
+            self._reload()
+            new = [name for name in uniques if name not in self._codes]
+            if len(self.names) + len(new) > MAX_CODES:
+                raise OverflowError(f"{self.path.name} would exceed {MAX_CODES} codes")
+            for name in new:
+                self._codes[name] = len(self.names)
+                self.names.append(name)
+            if new:
+                self._save()
+        return self._map(values)[0]
+
+    def decode(self, codes):
+        codes = np.asarray(codes)
+        if len(codes) and codes.max() >= len(self.names):
+            with self._lock:
+                self._reload()
+        categories = pd.Index(self.names, dtype=object)
+        return pd.Categorical.from_codes(codes, categories=categories, validate=False)
+
+
+# --- Chain Pairs -----------------------------------------------------------------------------------------------
+# A path is the pair (source, destination) packed into one int32, which groups and joins as a single integer key.
+def pair_codes(source, destination):
+    source, destination = np.asarray(source, dtype=np.int32), np.asarray(destination, dtype=np.int32)
+    return np.where((source >= 0) & (destination >= 0), (source << 16) | destination, NULL_CODE).astype(np.int32)
+
+
+def split_pairs(pairs):
+    pairs = np.asarray(pairs, dtype=np.int32)
+    valid = pairs >= 0
+    return np.where(valid, pairs >> 16, NULL_CODE), np.where(valid, pairs & 0xFFFF, NULL_CODE)
+
+
+def decode_pairs(chains, pairs, separator="➡"):
+    """Labels like "ethereum➡base" for packed pair codes; each distinct pair is formatted once."""
+    uniques, inverse = np.unique(np.asarray(pairs, dtype=np.int32), return_inverse=True)
+    source, destination = (np.asarray(chains.decode(codes), dtype=object) for codes in split_pairs(uniques))
+    labels = np.array([
+        None if pd.isna(s) or pd.isna(d) else f"{s}{separator}{d}" for s, d in zip(source, destination)
+    ], dtype=object)
+    return labels[inverse.ravel()]
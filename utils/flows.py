@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from utils.codes import NULL_CODE
+
+# --- Flow Matrix -----------------------------------------------------------------------------------------------
+# Dense (N+1)×(N+1) arrays of transfers, volume and fees per (source, destination) chain code, built once per range
+# from the daily store with one bincount per metric. The extra last row/column collects transfers whose source or
+# destination is NULL, so row and column sums equal the per-chain totals of the source and destination tables.
+# Heatmap, Sankey and marginals all read from these arrays instead of going back to the data.
+FLOW_METRICS = {
+    "🚀Transfers": "transfers",
+    "💸Volume($)": "volume_usd",
+    "⛽Fees($)": "fee_usd",
+}
+
+
+def build_flow_matrix(df_daily, chains):
+    """`{"chains": names, metric: (N+1, N+1) array}` for the daily rows, with N = len(chains)."""
+    n = len(chains)
+    size = n + 1
+    source = df_daily["source_chain"].to_numpy(dtype=np.int32)
+    destination = df_daily["destination_chain"].to_numpy(dtype=np.int32)
+    cell = np.where(source == NULL_CODE, n, source) * size + np.where(destination == NULL_CODE, n, destination)
+    matrix = {"chains": np.asarray(chains, dtype=object)}
+    for column in FLOW_METRICS.values():
+        weights = np.nan_to_num(df_daily[column].to_numpy(dtype=np.float64))
+        matrix[column] = np.bincount(cell, weights=weights, minlength=size * size).reshape(size, size)
+    return matrix
+
+
+def flow_marginals(matrix, column):
+    """Outgoing (row) and incoming (column) totals per chain, NULL bucket excluded."""
+    values = matrix[column]
+    return (
+        pd.Series(values.sum(axis=1)[:-1], index=matrix["chains"]),
+        pd.Series(values.sum(axis=0)[:-1], index=matrix["chains"]),
+    )
+
+
+def top_chains(matrix, column, limit):
+    """Indices of the `limit` chains with the largest combined in+out flow, largest first."""
+    outgoing, incoming = flow_marginals(matrix, column)
+    total = outgoing.to_numpy() + incoming.to_numpy()
+    order = np.argsort(-total, kind="stable")
+    return order[total[order] > 0][:limit]
+
+
+def flow_frame(matrix, column, chains_idx):
+    """The known-chain block of the matrix restricted to `chains_idx`, labelled with chain names."""
+    names = matrix["chains"][chains_idx]
+    block = matrix[column][np.ix_(chains_idx, chains_idx)]
+    return pd.DataFrame(block, index=pd.Index(names, name="source"), columns=pd.Index(names, name="destination"))
+
+
+def flow_links(matrix, column, chains_idx, limit):
+    """The `limit` largest (source, destination, value) links among `chains_idx`, for a Sankey diagram."""
+    block = matrix[column][np.ix_(chains_idx, chains_idx)]
+    flat = block.ravel()
+    order = np.argsort(-flat, kind="stable")
+    order = order[flat[order] > 0][:limit]
+    source, destination = np.divmod(order, len(chains_idx))
+    return pd.DataFrame({"source": source, "destination": destination, "value": flat[order]})
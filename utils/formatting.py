@@ -0,0 +1,44 @@
+import pandas as pd
+import streamlit as st
+
+from utils.tracing import span
+
+# --- Table Formatting ------------------------------------------------------------------------------------------
+# Tables keep their numeric dtypes and are formatted in the browser through column_config, so Streamlit can still
+# sort them numerically and only ships numbers rather than pre-rendered strings.
+NUMBER_FORMAT = "%,.0f"
+COLUMN_FORMATS = {
+    "💨Avg Fee($)": "%,.3f",
+}
+
+
+def table_column_config(df, formats=None):
+    formats = {**COLUMN_FORMATS, **(formats or {})}
+    return {
+        col: st.column_config.NumberColumn(format=formats.get(col, NUMBER_FORMAT))
+        for col in df.columns[1:]
+    }
+
+
+def show_table(df, height=400, formats=None, start=1):
+    """Show `df` with its first column as the label, numbers formatted per column and the index starting from `start`."""
+    with span("render", f"table {df.columns[0]}", rows=len(df)):
+        df_display = df.set_axis(range(start, start + len(df)))
+        st.dataframe(df_display, height=height, column_config=table_column_config(df, formats))
+
+
+# --- KPI Card Text ---------------------------------------------------------------------------------------------
+# Top-by cards format one metric of a rollup's top row. An empty range (or an all-NaN column) has no top row, and
+# its card shows "—" instead of "nan".
+def value_text(value, template, scale=1):
+    """`value / scale` formatted with `template`, or "—" when the value is missing."""
+    if pd.isna(value):
+        return "—"
+    return template.format(value / scale if scale != 1 else value)
+
+
+def card_text(row, label, column, template, scale=1):
+    """"label (value)" for the top row `row` of a rollup, or "—" when it has no value in `column`."""
+    if pd.isna(row[column]):
+        return "—"
+    return f"{row[label]} ({value_text(row[column], template, scale)})"
@@ -0,0 +1,28 @@
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks only cover threads of this process
+    fcntl = None
+
+# --- File Locks ------------------------------------------------------------------------------------------------
+# The store, its code dictionaries and the result cache live on disk and are shared by every Streamlit process on
+# the host. A thread lock orders this process's threads; an exclusive flock on a lock file then orders the processes.
+
+
+@contextmanager
+def file_lock(path, thread_lock):
+    """Hold `thread_lock`, then an exclusive flock on `path` (created if missing)."""
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
@@ -0,0 +1,146 @@
+import argparse
+import os
+
+# --- Normalized Fact Source ------------------------------------------------------------------------------------
+# fact_transfers and fact_gmp keep amounts, prices and fees inside the `data` VARIANT, and every dashboard query
+# used to re-extract them with stacked IS_ARRAY / IS_OBJECT / TRY_TO_DOUBLE checks. The SELECT below parses them
+# once into flat typed columns keyed by id. Running `python -m utils.normalize --table DB.SCHEMA.NAME` materializes
+# it as a Snowflake dynamic table; setting AXELAR_NORMALIZED_TABLE to that name makes every dashboard query read the
+# flat columns. Without it the same parsing is inlined, so the queries work either way.
+NORMALIZED_TABLE = os.environ.get("AXELAR_NORMALIZED_TABLE", "")
+NORMALIZED_COLUMNS = [
+    "created_at", "id", "tx_hash", "user", "source_chain", "destination_chain",
+    "service", "amount", "amount_usd", "fee", "raw_asset",
+]
+
+
+# The same field list is rendered for Snowflake VARIANT paths and for DuckDB JSON strings (utils/offline.py), so
+# the offline backend parses snapshots exactly like the warehouse does.
+class SnowflakeDialect:
+    @staticmethod
+    def text(path):
+        return f"data:{path}::STRING"
+
+    @staticmethod
+    def number(path):
+        return (f"CASE WHEN IS_ARRAY(data:{path}) OR IS_OBJECT(data:{path}) THEN NULL "
+                f"ELSE TRY_TO_DOUBLE(data:{path}::STRING) END")
+
+
+class DuckDBDialect:
+    @staticmethod
+    def text(path):
+        return f"json_extract_string(data, '$.{path}')"
+
+    @staticmethod
+    def number(path):
+        return (f"CASE WHEN json_type(data, '$.{path}') IN ('ARRAY', 'OBJECT') THEN NULL "
+                f"ELSE TRY_CAST(json_extract_string(data, '$.{path}') AS DOUBLE) END")
+
+
+def _transfers_sql(where, dialect):
+    text, number = dialect.text, dialect.number
+    return f"""
+  SELECT
+    created_at,
+    id,
+    SPLIT_PART(id, '_', 1) AS tx_hash,
+    sender_address AS user,
+    LOWER({text("send.original_source_chain")}) AS source_chain,
+    LOWER({text("send.original_destination_chain")}) AS destination_chain,
+    'Token Transfers' AS service,
+    {number("send.amount")} AS amount,
+    {number("send.amount")} * {number("link.price")} AS amount_usd,
+    {number("send.fee_value")} AS fee,
+    {text("link.asset")} AS raw_asset
+  FROM axelar.axelscan.fact_transfers
+  WHERE {where}
+    AND status = 'executed'
+    AND simplified_status = 'received'
+"""
+
+
+def _gmp_sql(where, dialect):
+    text, number = dialect.text, dialect.number
+    return f"""
+  SELECT
+    created_at,
+    id,
+    SPLIT_PART(id, '_', 1) AS tx_hash,
+    {text("call.transaction.from")} AS user,
+    LOWER({text("call.chain")}) AS source_chain,
+    LOWER({text("call.returnValues.destinationChain")}) AS destination_chain,
+    'GMP' AS service,
+    {number("amount")} AS amount,
+    {number("value")} AS amount_usd,
+    COALESCE(
+      {number("gas.gas_used_amount")} * {number("gas_price_rate.source_token.token_price.usd")},
+      {number("fees.express_fee_usd")}
+    ) AS fee,
+    {text("symbol")} AS raw_asset
+  FROM axelar.axelscan.fact_gmp
+  WHERE {where}
+    AND status = 'executed'
+    AND simplified_status = 'received'
+"""
+
+
+def service_union_sql(where="TRUE", dialect=SnowflakeDialect):
+    """Token transfers and GMP calls with parsed DOUBLE columns; `where` is applied inside both base scans."""
+    return f"{_transfers_sql(where, dialect)}\n  UNION ALL\n{_gmp_sql(where, dialect)}"
+
+
+def normalized_table(pool):
+    """The normalized table to read for `pool`: the offline backend always has one, Snowflake only if configured."""
+    return getattr(pool, "normalized_table", None) or NORMALIZED_TABLE
+
+
+def service_source_sql(where="TRUE", table=NORMALIZED_TABLE):
+    if table:
+        return f"SELECT * FROM {table} WHERE {where}"
+    return service_union_sql(where)
+
+
+def transfers_source_sql(where="TRUE", table=NORMALIZED_TABLE):
+    """Token transfers only (the rows EZ_BRIDGE_SATELLITE joins to), from the normalized table when available.
+
+    Only the normalized table has tx_hash stored; the inlined fallback splits it out of `id` on every row."""
+    if table:
+        return f"SELECT * FROM {table} WHERE service = 'Token Transfers' AND {where}"
+    return _transfers_sql(where, SnowflakeDialect)
+
+
+# --- Setup Command ---------------------------------------------------------------------------------------------
+def build_setup_sql(table, warehouse, target_lag="1 hour"):
+    return f"""
+CREATE OR REPLACE DYNAMIC TABLE {table}
+  TARGET_LAG = '{target_lag}'
+  WAREHOUSE = {warehouse}
+  CLUSTER BY (created_at::date)
+AS
+{service_union_sql()}
+"""
+
+
+def main():
+    from utils.connection import get_pool
+
+    parser = argparse.ArgumentParser(description="Create the normalized Axelar fact table in Snowflake.")
+    parser.add_argument("--table", required=True, help="fully qualified name, e.g. ANALYTICS.AXELAR.SERVICE_NORMALIZED")
+    parser.add_argument("--warehouse", required=True)
+    parser.add_argument("--target-lag", default="1 hour")
+    parser.add_argument("--dry-run", action="store_true", help="print the DDL instead of running it")
+    args = parser.parse_args()
+
+    sql = build_setup_sql(args.table, args.warehouse, args.target_lag)
+    if args.dry_run:
+        print(sql)
+        return
+    with get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql)
+    print(f"Created {args.table}. Set AXELAR_NORMALIZED_TABLE={args.table} to read from it.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import argparse
+import os
+import threading
+import time
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from utils.normalize import DuckDBDialect, service_union_sql
+
+# --- Offline DuckDB Backend ------------------------------------------------------------------------------------
+# A local stand-in for Snowflake: Parquet copies of fact_transfers, fact_gmp and EZ_BRIDGE_SATELLITE under
+# offline_dir() are exposed inside an in-memory DuckDB under their warehouse names, and the VARIANT parsing of
+# utils/normalize.py is materialized once at startup. The dashboard queries then run unchanged, so pages and
+# benchmarks work without secrets or network access (AXELAR_BACKEND=duckdb). The `data` column is stored as a
+# JSON string. DuckDB is only needed here, so it is listed in requirements-offline.txt rather than requirements.txt.
+SOURCE_TABLES = {
+    "axelar.axelscan.fact_transfers": "fact_transfers.parquet",
+    "axelar.axelscan.fact_gmp": "fact_gmp.parquet",
+    "axelar.defi.ez_bridge_satellite": "ez_bridge_satellite.parquet",
+}
+NORMALIZED_VIEW = "axelar.normalized.service"
+
+
+def offline_dir():
+    return Path(os.environ.get("AXELAR_OFFLINE_DIR", ".offline"))
+
+
+def _snowflake_case(columns):
+    # Snowflake returns unquoted identifiers in upper case; quoted aliases such as "Source Chain" keep theirs.
+    return [col.upper() if col == col.lower() else col for col in columns]
+
+
+class DuckDBBackend:
+    normalized_table = NORMALIZED_VIEW
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root else offline_dir()
+        self.cache_namespace = f"duckdb:{self.root.resolve()}"  # results of different fixture sets never mix
+        missing = [name for name in SOURCE_TABLES.values() if not (self.root / name).exists()]
+        if missing:
+            raise FileNotFoundError(
+                f"Offline data missing in {self.root}: {', '.join(missing)}. "
+                f"Create it with `python -m utils.offline synth` or `python -m utils.offline snapshot`."
+            )
+        self._con = duckdb.connect()
+        self._lock = threading.Lock()
+        self._con.execute("ATTACH ':memory:' AS axelar")
+        for schema in ("axelscan", "defi", "normalized"):
+            self._con.execute(f"CREATE SCHEMA axelar.{schema}")
+        for table, file_name in SOURCE_TABLES.items():
+            self._con.execute(f"CREATE VIEW {table} AS SELECT * FROM read_parquet('{(self.root / file_name).as_posix()}')")
+        self._con.execute(f"CREATE TABLE {NORMALIZED_VIEW} AS {service_union_sql(dialect=DuckDBDialect)}")
+
+    def query(self, query, stats=None, params=None):
+        with self._lock:
+            cur = self._con.cursor()  # one cursor per query; DuckDB connections are not shared across threads
+        try:
+            start = time.perf_counter()
+            cur.execute(query, params)
+            executed = time.perf_counter()
+            df = cur.fetch_df()
+        finally:
+            cur.close()
+        if stats is not None:
+            stats.update(query_id=None, execute_s=executed - start, fetch_s=time.perf_counter() - executed)
+        df.columns = _snowflake_case(df.columns)
+        return df
+
+
+# --- Synthetic Data --------------------------------------------------------------------------------------------
+# Rows shaped like the warehouse tables, including a share of non-executed rows and unparseable amounts, so the
+# filters and TRY_ parsing are exercised too. Roughly a third of the token transfers also appear in the satellite
+# table under the same tx hash.
+CHAINS = ["ethereum", "arbitrum", "base", "polygon", "avalanche", "binance", "optimism", "osmosis", "sei", "fantom"]
+ASSETS = ["uusdc", "uaxl", "weth-wei", "wbtc-satoshi", "uusdt", "wmatic-wei", "wavax-wei", "dai-wei"]
+SATELLITE_TOKENS = ["USDC", "AXL", "WETH", "WBTC", "USDT", "WMATIC", "WAVAX", "DAI"]
+
+
+def _skewed_index(rng, n, size, skew=1.2):
+    weights = 1 / np.arange(1, n + 1) ** skew
+    return rng.choice(n, size=size, p=weights / weights.sum())
+
+
+def _choice(rng, values, size):
+    return np.asarray(values, dtype=object)[_skewed_index(rng, len(values), size)]
+
+
+def _numbers(rng, size, scale, malformed=0.01):
+    values = pd.Series(np.round(rng.lognormal(np.log(scale), 1.5, size), 6)).astype(str)
+    broken = rng.random(size) < malformed
+    values[broken] = np.where(rng.random(broken.sum()) < 0.5, "[1, 2]", '"n/a"')
+    return values
+
+
+def _timestamps(rng, size, start_date, end_date):
+    start = pd.Timestamp(start_date).value
+    end = (pd.Timestamp(end_date) + pd.Timedelta(days=1)).value
+    return pd.to_datetime(np.sort(rng.integers(start, end, size)))
+
+
+def _status(rng, size):
+    executed = rng.random(size) < 0.95
+    return np.where(executed, "executed", "failed"), np.where(executed, "received", "failed")
+
+
+def _tx_hashes(rng, size, prefix):
+    return pd.Series(rng.integers(0, 2 ** 62, size)).map(lambda v: f"0x{prefix}{v:016x}")
+
+
+def synthetic_tables(rows=100_000, start_date="2025-01-01", end_date="2025-06-30", seed=0):
+    rng = np.random.default_rng(seed)
+    users = pd.Series(np.arange(max(rows // 20, 10))).map(lambda v: f"0x{v:040x}").to_numpy(dtype=object)
+    n_transfers, n_gmp = int(rows * 0.6), rows - int(rows * 0.6)
+
+    tx = _tx_hashes(rng, n_transfers, "a")
+    source, destination = _choice(rng, CHAINS, n_transfers), _choice(rng, CHAINS, n_transfers)
+    asset_idx = _skewed_index(rng, len(ASSETS), n_transfers)
+    status, simplified = _status(rng, n_transfers)
+    data = (
+        '{"send":{"original_source_chain":"' + pd.Series(source).str.title() +
+        '","original_destination_chain":"' + pd.Series(destination).str.title() +
+        '","amount":' + _numbers(rng, n_transfers, 500) +
+        ',"fee_value":' + _numbers(rng, n_transfers, 0.5) +
+        '},"link":{"asset":"' + pd.Series(np.asarray(ASSETS)[asset_idx]) +
+        '","price":' + _numbers(rng, n_transfers, 1) + '}}'
+    )
+    fact_transfers = pd.DataFrame({
+        "created_at": _timestamps(rng, n_transfers, start_date, end_date),
+        "id": tx + "_" + pd.Series(rng.integers(0, 4, n_transfers)).astype(str),
+        "status": status,
+        "simplified_status": simplified,
+        "sender_address": users[rng.integers(0, len(users), n_transfers)],
+        "data": data,
+    })
+
+    gmp_source, gmp_destination = _choice(rng, CHAINS, n_gmp), _choice(rng, CHAINS, n_gmp)
+    status, simplified = _status(rng, n_gmp)
+    data = (
+        '{"call":{"chain":"' + pd.Series(gmp_source) +
+        '","transaction":{"from":"' + pd.Series(users[rng.integers(0, len(users), n_gmp)]) +
+        '"},"returnValues":{"destinationChain":"' + pd.Series(gmp_destination) +
+        '"}},"symbol":"' + pd.Series(_choice(rng, SATELLITE_TOKENS, n_gmp)) +
+        '","amount":' + _numbers(rng, n_gmp, 300) +
+        ',"value":' + _numbers(rng, n_gmp, 300) +
+        ',"gas":{"gas_used_amount":' + _numbers(rng, n_gmp, 0.01) +
+        '},"gas_price_rate":{"source_token":{"token_price":{"usd":' + _numbers(rng, n_gmp, 20) +
+        '}}},"fees":{"express_fee_usd":' + _numbers(rng, n_gmp, 0.2) + '}}'
+    )
+    fact_gmp = pd.DataFrame({
+        "created_at": _timestamps(rng, n_gmp, start_date, end_date),
+        "id": _tx_hashes(rng, n_gmp, "b") + "_0",
+        "status": status,
+        "simplified_status": simplified,
+        "data": data,
+    })
+
+    on_satellite = rng.random(n_transfers) < 0.35
+    satellite = fact_transfers[on_satellite]
+    ez_bridge_satellite = pd.DataFrame({
+        "block_timestamp": satellite["created_at"].to_numpy(),
+        "tx_hash": tx[on_satellite].to_numpy(),
+        "source_chain": source[on_satellite],
+        "destination_chain": destination[on_satellite],
+        "sender": satellite["sender_address"].to_numpy(),
+        "token_symbol": np.asarray(SATELLITE_TOKENS)[asset_idx[on_satellite]],
+    })
+    return {
+        "fact_transfers.parquet": fact_transfers,
+        "fact_gmp.parquet": fact_gmp,
+        "ez_bridge_satellite.parquet": ez_bridge_satellite,
+    }
+
+
+def write_tables(tables, root=None):
+    root = Path(root) if root else offline_dir()
+    root.mkdir(parents=True, exist_ok=True)
+    for file_name, df in tables.items():
+        tmp = root / f"{file_name}.tmp"
+        df.to_parquet(tmp, index=False)
+        tmp.replace(root / file_name)
+
+
+# --- Snapshots -------------------------------------------------------------------------------------------------
+# Copies the columns the dashboard reads from Snowflake for a date range, with `data` serialized to JSON text.
+def snapshot_queries(start_date, end_date):
+    return {
+        "fact_transfers.parquet": f"""
+            SELECT created_at, id, status, simplified_status, sender_address, TO_JSON(data) AS data
+            FROM axelar.axelscan.fact_transfers
+            WHERE created_at::date >= '{start_date}' AND created_at::date <= '{end_date}'""",
+        "fact_gmp.parquet": f"""
+            SELECT created_at, id, status, simplified_status, TO_JSON(data) AS data
+            FROM axelar.axelscan.fact_gmp
+            WHERE created_at::date >= '{start_date}' AND created_at::date <= '{end_date}'""",
+        "ez_bridge_satellite.parquet": f"""
+            SELECT block_timestamp, tx_hash, source_chain, destination_chain, sender, token_symbol
+            FROM AXELAR.DEFI.EZ_BRIDGE_SATELLITE
+            WHERE block_timestamp::date >= '{start_date}' AND block_timestamp::date <= '{end_date}'""",
+    }
+
+
+def snapshot_tables(pool, start_date, end_date):
+    tables = {}
+    for file_name, query in snapshot_queries(start_date, end_date).items():
+        df = pool.query(query)
+        df.columns = df.columns.str.lower()
+        tables[file_name] = df
+    return tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create the Parquet files behind the offline DuckDB backend.")
+    parser.add_argument("--out", default=str(offline_dir()))
+    commands = parser.add_subparsers(dest="command", required=True)
+    synth = commands.add_parser("synth", help="generate synthetic tables")
+    synth.add_argument("--rows", type=int, default=100_000)
+    synth.add_argument("--start", default="2025-01-01")
+    synth.add_argument("--end", default="2025-06-30")
+    synth.add_argument("--seed", type=int, default=0)
+    snapshot = commands.add_parser("snapshot", help="copy a date range from Snowflake (needs secrets)")
+    snapshot.add_argument("--start", required=True)
+    snapshot.add_argument("--end", required=True)
+    args = parser.parse_args()
+
+    if args.command == "synth":
+        tables = synthetic_tables(args.rows, args.start, args.end, args.seed)
+    else:
+        from utils.connection import ConnectionPool, _connect_from_secrets
+        connect, _ = _connect_from_secrets()
+        tables = snapshot_tables(ConnectionPool(connect, max_size=1), args.start, args.end)
+    write_tables(tables, args.out)
+    for file_name, df in tables.items():
+        print(f"{file_name}: {len(df):,} rows")
+
+
+if __name__ == "__main__":
+    main()
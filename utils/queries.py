@@ -0,0 +1,85 @@
+import functools
+import hashlib
+import re
+
+import pandas as pd
+
+# --- Query Registry --------------------------------------------------------------------------------------------
+# Every warehouse query is a named template registered here. A template's builder returns SQL whose values appear
+# only as %(name)s markers; structural options such as the source table are the builder's arguments. Binding
+# validates each value against its declared type and compiles the markers to positional `?` binds, so the text
+# sent to the warehouse is identical for every date range: Snowflake's result cache keys on text plus bind values,
+# and the same canonical text, hash and values key the local result cache and the query trace.
+QUERIES = {}
+_MARKER = re.compile(r"%\((\w+)\)s")
+
+
+def _timestamp(value):
+    return pd.Timestamp(value).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _date(value):
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+PARAM_TYPES = {"timestamp": _timestamp, "date": _date}
+
+
+def canonical(sql):
+    return " ".join(sql.split())
+
+
+class BoundQuery:
+    def __init__(self, template, text, values):
+        self.template = template
+        self.text = text
+        self.values = values
+        self.args = [values[name] for name in _MARKER.findall(text)]
+        self.sql = _MARKER.sub("?", text)
+
+    @property
+    def name(self):
+        return self.template.name
+
+    @property
+    def text_hash(self):
+        return hashlib.sha256(self.text.encode()).hexdigest()[:16]
+
+
+class QueryTemplate:
+    def __init__(self, name, build, params):
+        self.name = name
+        self.build = build
+        self.params = params
+
+    @functools.lru_cache(maxsize=None)
+    def text(self, **options):
+        """Canonical SQL for `options`: whitespace collapsed, values still as %(name)s markers."""
+        text = canonical(self.build(**options))
+        unknown = set(_MARKER.findall(text)) - set(self.params)
+        if unknown:
+            raise ValueError(f"{self.name}: undeclared parameters {sorted(unknown)}")
+        return text
+
+    def _coerce(self, name, value):
+        kind = self.params[name]
+        if isinstance(kind, (tuple, frozenset, set)):
+            if value not in kind:
+                raise ValueError(f"{self.name}: {name}={value!r} is not one of {sorted(kind)}")
+            return value
+        return PARAM_TYPES[kind](value)
+
+    def bind(self, values, **options):
+        missing = set(self.params) - set(values)
+        if missing:
+            raise ValueError(f"{self.name}: missing parameters {sorted(missing)}")
+        values = {name: self._coerce(name, values[name]) for name in self.params}
+        return BoundQuery(self, self.text(**options), values)
+
+
+def register(name, **params):
+    """Register the decorated builder as query `name`; `params` maps each bind parameter to its type."""
+    def decorate(build):
+        QUERIES[name] = QueryTemplate(name, build, params)  # a module reload simply replaces its templates
+        return QUERIES[name]
+    return decorate
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+# --- Top-By Index ----------------------------------------------------------------------------------------------
+# KPI cards and ranking widgets ask "which row is largest by X" of the same rollup over and over. The index sorts
+# every metric column once, in one argsort over the (rows x metrics) matrix, and is kept next to the rollup it was
+# built from. Orders are descending; ties keep the rollup's row order (the first row wins, like idxmax) and NaN
+# rows sort last, so an all-NaN or empty column has no top row instead of raising.
+class TopIndex:
+    def __init__(self, df, columns=None):
+        self.df = df.reset_index(drop=True)
+        self.label = self.df.columns[0]
+        self.columns = list(columns) if columns is not None else list(self.df.select_dtypes("number").columns)
+        values = self.df[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        missing = np.isnan(values)
+        self._order = np.argsort(np.where(missing, np.inf, -values), axis=0, kind="stable")
+        self._valid = dict(zip(self.columns, (~missing).sum(axis=0)))
+        self._position = {column: i for i, column in enumerate(self.columns)}
+
+    def order(self, column, nulls=False):
+        """Row positions by `column`, largest first; NaN rows are left out unless `nulls`."""
+        order = self._order[:, self._position[column]]
+        return order if nulls else order[:self._valid[column]]
+
+    def top(self, column, k=1):
+        return self.df.iloc[self.order(column)[:k]]
+
+    def best(self, column):
+        """The top row by `column`, or a placeholder labelled "—" with NaN metrics when the column has no values."""
+        order = self.order(column)
+        if len(order):
+            return self.df.iloc[order[0]]
+        return pd.Series({self.label: "—", **dict.fromkeys(self.columns, np.nan)})
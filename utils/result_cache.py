@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from utils.locks import file_lock
+
+# --- Shared Result Cache ---------------------------------------------------------------------------------------
+# Query results are kept as Parquet files under RESULT_CACHE_DIR, keyed by a fingerprint of the whitespace-
+# normalized query text, its bound parameters and the backend it ran on. Every Streamlit process on the host reads
+# the same directory, so a result fetched by one replica or session is served to all of them until it is `ttl`
+# seconds old. A miss takes an exclusive file lock for its key before querying, so concurrent misses for the same
+# query wait for the one in flight and then read its result instead of firing their own. Reads bump the file's
+# access time, and writes evict the least recently read files once the directory grows past `max_bytes`.
+RESULT_CACHE_DIR = Path(os.environ.get("AXELAR_RESULT_CACHE_DIR", ".cache/results"))
+RESULT_CACHE_MB = int(os.environ.get("AXELAR_RESULT_CACHE_MB", "512"))  # 0 disables the cache
+RESULT_TTL = int(os.environ.get("AXELAR_RESULT_TTL", "300"))
+LOCK_STRIPES = 256  # keys share lock files by their first two hex digits, so lock files stay bounded
+
+
+def fingerprint(query, params=None, namespace=None):
+    payload = {"query": " ".join(query.split()), "params": params or {}, "namespace": namespace}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, root=RESULT_CACHE_DIR, max_bytes=RESULT_CACHE_MB * 2 ** 20, ttl=RESULT_TTL):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._thread_locks = [threading.Lock() for _ in range(LOCK_STRIPES + 1)]
+
+    def _locked(self, stripe):
+        return file_lock(self.root / "_locks" / f"{stripe:03d}.lock", self._thread_locks[stripe])
+
+    def _path(self, key):
+        return self.root / f"{key}.parquet"
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            written = path.stat().st_mtime
+            if time.time() - written > self.ttl:
+                return None
+            df = pd.read_parquet(path)
+            os.utime(path, (time.time(), written))  # recency for eviction; mtime keeps the write time for the TTL
+            return df
+        except (FileNotFoundError, OSError, ValueError):  # evicted or half-gone between stat and read
+            return None
+
+    def put(self, key, df):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self._path(key).with_suffix(f".{os.getpid()}.tmp")
+        df.to_parquet(tmp, index=False)
+        tmp.replace(self._path(key))
+        self._evict()
+
+    def _evict(self):
+        with self._locked(LOCK_STRIPES):
+            files = []
+            for path in self.root.glob("*.parquet"):
+                try:
+                    files.append((path.stat().st_atime, path.stat().st_size, path))
+                except FileNotFoundError:
+                    continue
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+    def get_or_compute(self, key, compute):
+        """`(df, cache_hit)`; on a miss only one caller per key runs `compute`, the others wait and read its result."""
+        if self.max_bytes <= 0:
+            return compute(), False
+        df = self.get(key)
+        if df is not None:
+            return df, True
+        with self._locked(int(key[:2], 16)):
+            df = self.get(key)
+            if df is not None:
+                return df, True
+            df = compute()
+            self.put(key, df)
+            return df, False
+
+    def clear(self):
+        for path in self.root.glob("*.parquet"):
+            path.unlink(missing_ok=True)
+
+
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
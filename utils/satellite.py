@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.connection import BACKEND, run_query
+from utils.normalize import NORMALIZED_TABLE, normalized_table
+from utils.queries import register
+from utils.satellite_sql import date_bounds, overview_sql
+from utils.sketch import build_sketches, estimate_distinct
+from utils.store import DailyStore
+from utils.tracing import annotate, traced, traced_loader
+
+# --- Satellite Daily Base --------------------------------------------------------------------------------------
+# Page 2 is served by one warehouse pull per range at (day, source_chain, destination_chain, token_symbol, sender)
+# grain. It is split locally into a daily table of sums per (day, source, destination, token), a daily senders
+# table at the same grain for exact user counts and per-day HyperLogLog sketches of senders overall and per source
+# chain, destination chain and token for approximate ones, all kept in a DailyStore. KPIs, every time-series
+# timeframe and the three breakdowns are rolled up from the daily table and one of the user tables, and
+# finalized days are never pulled again, so a refresh only re-fetches the open tail of the range. As on page 1, the
+# breakdowns group locally, so chains and token symbols are stored as int16 codes from the store's "chain" and
+# "token" dictionaries (utils/codes.py) and decoded only for the labelled breakdown.
+BASE_DTYPES = {"TRANSFERS": "int64", "VOLUME_USD": "float64", "VOLUME_COUNT": "int64"}
+DAILY_KEYS = ["day", "source_chain", "destination_chain", "token_symbol"]
+DAILY_SCHEMA = {
+    "day": "datetime64[ns]", "source_chain": "int16", "destination_chain": "int16", "token_symbol": "int16",
+    "transfers": "int64", "volume_usd": "float64", "volume_count": "int64",
+}
+USERS_SCHEMA = {
+    "day": "datetime64[ns]", "source_chain": "int16", "destination_chain": "int16", "token_symbol": "int16",
+    "sender": "str",
+}
+SKETCH_SCHEMA = {"day": "datetime64[ns]", "dimension": "str", "key": "int32", "registers": "object"}
+DAILY_COLUMNS = list(DAILY_SCHEMA)
+USERS_COLUMNS = list(USERS_SCHEMA)
+SKETCH_COLUMNS = list(SKETCH_SCHEMA)
+SKETCH_DIMENSIONS = ["all", "source_chain", "destination_chain", "token_symbol"]
+CODED_COLUMNS = {"source_chain": "chain", "destination_chain": "chain", "token_symbol": "token"}
+STORE_VERSION = 3
+TIMEFRAMES = {"day": "D", "week": "W-SUN", "month": "M"}  # W-SUN periods start on Monday, like DATE_TRUNC('week')
+
+
+@register("satellite.base", since="timestamp", until="timestamp",
+          transfers_since="timestamp", transfers_until="timestamp")
+def base_query(table=NORMALIZED_TABLE):
+    return f"""
+    WITH overview AS ({overview_sql(table)}
+    )
+    SELECT
+      date AS day,
+      source_chain,
+      destination_chain,
+      token_symbol,
+      sender,
+      COUNT(DISTINCT tx_hash) AS transfers,
+      SUM(amount_usd) AS volume_usd,
+      COUNT(amount_usd) AS volume_count
+    FROM overview
+    GROUP BY 1, 2, 3, 4, 5;
+    """
+
+
+def encode_names(df):
+    store = get_satellite_store()
+    return df.assign(**{col: store.codes(name).encode(df[col]) for col, name in CODED_COLUMNS.items()})
+
+
+def to_daily_users(df):
+    return df[USERS_COLUMNS].dropna(subset=["sender"]).drop_duplicates(ignore_index=True).astype({"sender": "str"})
+
+
+def to_user_sketches(df):
+    frames = []
+    for dimension in SKETCH_DIMENSIONS:
+        if dimension == "all":
+            rows = df.assign(all=0)
+        elif dimension == "token_symbol":
+            rows = df[df["destination_chain"] >= 0]  # the token breakdown has always counted these rows only
+        else:
+            rows = df[df[dimension] >= 0]
+        sketches = build_sketches(rows, ["day", dimension], "sender")
+        frames.append(sketches.rename(columns={dimension: "key"}).assign(dimension=dimension))
+    out = pd.concat(frames, ignore_index=True)[SKETCH_COLUMNS]
+    return out.astype({"key": "int32"})
+
+
+def fetch_satellite_days(pool, start_date, end_date):
+    query = base_query.bind(date_bounds(start_date, end_date), table=normalized_table(pool))
+    df = run_query(pool, query, BASE_DTYPES)
+    df.columns = df.columns.str.lower()
+    df = encode_names(df).assign(day=pd.to_datetime(df["day"]))
+    daily = df.groupby(DAILY_KEYS, sort=False)[["transfers", "volume_usd", "volume_count"]].sum(
+        min_count=1
+    ).reset_index()
+    daily["transfers"] = daily["transfers"].fillna(0).astype("int64")
+    daily["volume_count"] = daily["volume_count"].fillna(0).astype("int64")
+    return {"daily": daily[DAILY_COLUMNS], "daily_users": to_daily_users(df), "user_sketches": to_user_sketches(df)}
+
+
+@st.cache_resource
+def get_satellite_store():
+    name = "satellite" if BACKEND == "snowflake" else f"satellite-{BACKEND}"  # keep offline data out of the real store
+    tables = {"daily": DAILY_SCHEMA, "daily_users": USERS_SCHEMA, "user_sketches": SKETCH_SCHEMA}
+    return DailyStore(name, fetch_satellite_days, tables, version=STORE_VERSION)
+
+
+@traced_loader
+def get_satellite_data(pool, start_date, end_date, exact=True):
+    """The (daily, daily_users, user_sketches) tables for the range; one warehouse job at most, none once stored.
+
+    Only the users table of the mode is read; the other is None."""
+    store = get_satellite_store()
+    annotate(cache_hit=not store.ensure(pool, start_date, end_date))
+    df_daily = store.read("daily", start_date, end_date)
+    if exact:
+        return df_daily, store.read("daily_users", start_date, end_date), None
+    return df_daily, None, store.read("user_sketches", start_date, end_date)
+
+
+# --- Local Rollups ---------------------------------------------------------------------------------------------
+# Transfers and volume add up across rows; distinct users are counted exactly from the daily senders table, or
+# estimated by merging the sender sketches of every day (and key) in the group when those are given instead. Sums
+# of all-NULL groups stay NULL, as in SQL. Keys are codes, with NULL = -1.
+def _users(df_users, df_sketches, dimension, relabel=None):
+    if df_users is None:
+        df = df_sketches[df_sketches["dimension"] == dimension]
+    elif dimension == "all":
+        df = df_users.assign(key=0)
+    else:
+        df = df_users[df_users[dimension] >= 0]
+        if dimension == "token_symbol":
+            df = df[df["destination_chain"] >= 0]  # the same rows as the token sketches and the token breakdown
+        df = df.assign(key=df[dimension])
+    if relabel is not None:
+        df = df.assign(key=relabel(df))
+    if df_users is None:
+        return estimate_distinct(df, "key")
+    return df.groupby("key", sort=False)["sender"].nunique()
+
+
+@traced("transform")
+def get_kpis(df_daily, df_users=None, df_sketches=None):
+    transfers = df_daily["transfers"].sum()
+    volume = df_daily["volume_usd"].sum(min_count=1)
+    volume_count = df_daily["volume_count"].sum()
+    users = _users(df_users, df_sketches, "all").sum()
+    per_user = users or np.nan
+    return pd.Series({
+        "TRANSFERS": transfers,
+        "USERS": users,
+        "VOLUME_USD": np.round(volume),
+        "AVG_TX_PER_USER": np.round(transfers / per_user),
+        "AVG_VOLUME_TX": np.round(volume / (volume_count or np.nan)),
+        "AVG_VOLUME_USER": np.round(volume / per_user),
+    })
+
+
+def _bucket(days, timeframe):
+    return pd.Series(days).dt.to_period(TIMEFRAMES[timeframe]).dt.start_time.to_numpy()
+
+
+@traced("transform")
+def resample_ts(df_daily, df_users, df_sketches, timeframe):
+    """Transfers, users and volume per `timeframe` bucket, with the same DATE values as DATE_TRUNC(timeframe)."""
+    grouped = df_daily.groupby(_bucket(df_daily["day"], timeframe))
+    volume = grouped["volume_usd"].sum(min_count=1)
+    out = pd.DataFrame({
+        "TRANSFERS": grouped["transfers"].sum(),
+        "USERS": _users(df_users, df_sketches, "all", lambda df: _bucket(df["day"], timeframe)),
+        "VOLUME_USD": volume.round(),
+        "AVG_VOLUME_TX": (volume / grouped["volume_count"].sum().replace(0, np.nan)).round(),
+    })
+    out["USERS"] = out["USERS"].fillna(0).astype("int64")
+    return out.rename_axis("DATE").reset_index()
+
+
+@traced("transform")
+def get_breakdown(df_daily, df_users, df_sketches, dimension, label):
+    """Transfers, users and volume per `dimension` value over the range, largest transfer count first."""
+    df = df_daily[df_daily[dimension] >= 0]
+    if dimension == "token_symbol":
+        df = df[df["destination_chain"] >= 0]
+    grouped = df.groupby(dimension, sort=False)
+    out = pd.DataFrame({
+        "Number of Transfers": grouped["transfers"].sum(),
+        "Number of Users": _users(df_users, df_sketches, dimension),
+        "Volume of Transfers (USD)": grouped["volume_usd"].sum(min_count=1).round(),
+    }).dropna(subset=["Number of Transfers"])
+    out["Number of Transfers"] = out["Number of Transfers"].astype("int64")
+    out["Number of Users"] = out["Number of Users"].fillna(0).astype("int64")
+    out = out.sort_values("Number of Transfers", ascending=False, kind="stable")
+    names = get_satellite_store().codes(CODED_COLUMNS[dimension]).decode(out.index.to_numpy())
+    out.index = np.asarray(names, dtype=object)
+    return out.rename_axis(label).reset_index()
@@ -0,0 +1,54 @@
+import pandas as pd
+
+from utils.normalize import NORMALIZED_TABLE, transfers_source_sql
+
+# --- Satellite Overview ----------------------------------------------------------------------------------------
+# Every satellite query is the same LEFT JOIN of EZ_BRIDGE_SATELLITE (tab1) to the token transfers (tab2) on tx
+# hash. Both sides are bounded on both ends with plain timestamp ranges ([since, until), no ::date casts on the
+# column) so the warehouse can prune partitions; tab2 is widened by JOIN_SLACK on each side so a satellite row
+# near a range edge still finds its transfer. Reading the tx hash without splitting `id` on every row of the join
+# depends on the optional normalized dynamic table (AXELAR_NORMALIZED_TABLE, utils/normalize.py), where it is
+# extracted once on write. Without it tab2 is the inlined fact_transfers parse and still computes
+# SPLIT_PART(id, '_', 1) per row, though only for the executed transfers inside its bounded range.
+JOIN_SLACK = pd.Timedelta(days=1)  # transfers are created within a day of the satellite row they join to
+SATELLITE_COLUMNS = "block_timestamp, tx_hash, source_chain, destination_chain, sender, token_symbol"
+
+
+def date_bounds(start_date, end_date):
+    """Bind values for overview_sql: [since, until) covering start_date..end_date, and the widened transfer range."""
+    since, until = pd.Timestamp(start_date), pd.Timestamp(end_date) + pd.Timedelta(days=1)
+    return {
+        "since": since,
+        "until": until,
+        "transfers_since": since - JOIN_SLACK,
+        "transfers_until": until + JOIN_SLACK,
+    }
+
+
+def satellite_sql(columns=SATELLITE_COLUMNS):
+    return f"""
+      SELECT {columns}
+      FROM AXELAR.DEFI.EZ_BRIDGE_SATELLITE
+      WHERE block_timestamp >= %(since)s::timestamp AND block_timestamp < %(until)s::timestamp"""
+
+
+def satellite_transfers_sql(table=NORMALIZED_TABLE):
+    transfers = transfers_source_sql(
+        "created_at >= %(transfers_since)s::timestamp AND created_at < %(transfers_until)s::timestamp", table
+    )
+    return f"""
+      SELECT tx_hash, amount, amount_usd
+      FROM ({transfers})"""
+
+
+def overview_sql(table=NORMALIZED_TABLE):
+    """Satellite rows with block_timestamp in [since, until), each with its transfer amounts (NULL if none)."""
+    return f"""
+      WITH tab1 AS ({satellite_sql()}
+      ),
+      tab2 AS ({satellite_transfers_sql(table)}
+      )
+      SELECT tab1.block_timestamp::date AS date, tab1.tx_hash, tab1.source_chain, tab1.destination_chain,
+             sender, token_symbol, amount, amount_usd
+      FROM tab1
+      LEFT JOIN tab2 ON tab1.tx_hash=tab2.tx_hash"""
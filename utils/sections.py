@@ -0,0 +1,30 @@
+import streamlit as st
+
+# --- Lazy Sections ---------------------------------------------------------------------------------------------
+# Page sections live in expanders that track their open state, and a section's body only runs once the viewer has
+# opened it in this session. After that it keeps rendering even when collapsed again, so reopening is instant, and
+# its rollup is remembered per session until the inputs it was computed from change. Warehouse and rollup work on
+# a page then follows what people actually open instead of everything top to bottom.
+OPENED_KEY = "_opened_sections"
+
+
+def lazy_section(label, key, render, *args, expanded=False):
+    """Run `render(*args)` inside an expander, but only once it has been opened in this session."""
+    with st.expander(label, expanded=expanded, key=key, on_change="rerun") as section:
+        opened = st.session_state.setdefault(OPENED_KEY, set())
+        if section.open:
+            opened.add(key)
+        if key in opened:
+            render(*args)
+        else:
+            st.caption("Expand to load this section.")
+
+
+def remember(key, inputs, compute):
+    """`compute()` once per `inputs` in this session; the last result is reused while the inputs stay the same."""
+    slot = st.session_state.get(f"_section_{key}")
+    if slot is not None and slot[0] == inputs:
+        return slot[1]
+    result = compute()
+    st.session_state[f"_section_{key}"] = (inputs, result)
+    return result
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+# --- HyperLogLog Sketches --------------------------------------------------------------------------------------
+# Mergeable distinct-count sketches built with NumPy. A sketch is a uint8 register array of size 2**PRECISION;
+# merging two sketches is an element-wise max, so a range's distinct count is estimated by merging the daily
+# sketches of every day in the range. PRECISION = 10 gives 1 KiB per sketch and a ~3.2% standard error.
+PRECISION = 10
+_RANK_BITS = 52  # low hash bits used for the rank; 52 bits convert to float64 exactly
+
+
+def hash_values(values):
+    values = pd.Series(values).dropna().astype(str)
+    return pd.util.hash_array(values.to_numpy(dtype=object), categorize=False)
+
+
+def _index_and_rank(hashes, precision):
+    index = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    rest = (hashes & np.uint64((1 << _RANK_BITS) - 1)).astype(np.float64)
+    with np.errstate(divide="ignore"):
+        rank = _RANK_BITS - np.floor(np.log2(rest))
+    rank[rest == 0] = _RANK_BITS + 1
+    return index, rank.astype(np.uint8)
+
+
+def build_sketches(df, keys, column, precision=PRECISION):
+    """One sketch of `column` per distinct `keys` combination, returned as keys + a `registers` bytes column."""
+    df = df[df[column].notna()]
+    m = 1 << precision
+    codes, uniques = pd.MultiIndex.from_frame(df[keys].astype(object)).factorize()
+    registers = np.zeros((len(uniques), m), dtype=np.uint8)
+    if len(df):
+        index, rank = _index_and_rank(hash_values(df[column]), precision)
+        np.maximum.at(registers, (codes, index), rank)
+    out = pd.DataFrame(list(uniques), columns=keys)
+    out["registers"] = [row.tobytes() for row in registers]
+    return out
+
+
+def _stack(registers):
+    buffer = b"".join(registers)
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(len(registers), -1)
+
+
+def merge_sketches(df, key):
+    """Merge every sketch that shares `key` into one register row per key value."""
+    df = df[df[key].notna()].sort_values(key, kind="stable")
+    if df.empty:
+        return pd.Index([], name=key), np.zeros((0, 1 << PRECISION), dtype=np.uint8)
+    keys = df[key].to_numpy()
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    merged = np.maximum.reduceat(_stack(df["registers"].tolist()), starts, axis=0)
+    return pd.Index(keys[starts], name=key), merged
+
+
+def estimate(registers):
+    m = registers.shape[1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.exp2(-registers.astype(np.float64)).sum(axis=1)
+    zeros = (registers == 0).sum(axis=1)
+    with np.errstate(divide="ignore"):
+        linear = m * np.log(m / zeros)
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+
+def estimate_distinct(df, key):
+    keys, merged = merge_sketches(df, key)
+    return pd.Series(np.round(estimate(merged)).astype("int64"), index=keys)
@@ -0,0 +1,230 @@
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from utils.codes import CodeDictionary
+from utils.locks import file_lock
+
+# --- Local Daily-Aggregate Store -------------------------------------------------------------------------------
+# Daily pre-aggregates are kept as one Parquet file per table and month under STORE_ROOT/<name>/<table>/. A single
+# fetch fills every table for the same days, so they never drift apart. The store may hold any set of days: the
+# metadata keeps the covered days and the finalized days as sorted runs of [first, last] days, and a request only
+# fetches the runs of its range that are not covered yet. Days fetched once they were `finalize_days` old are
+# immutable and never re-fetched. The open tail of covered-but-not-final days goes stale after `tail_ttl` seconds; a
+# request touching a stale tail is still served the stored days at once, while a background thread re-pulls the tail
+# from Snowflake and swaps it in. Every change bumps the store's `generation`. Each table is declared with its column
+# dtypes, so a range with nothing stored still reads as a correctly typed empty frame. Code dictionaries for the
+# encoded columns live in the same directory, and bumping `version` discards both for a clean rebuild. Several
+# Streamlit processes may share one store, so every change to partitions or metadata is made under a file lock
+# (utils/locks.py) next to the store directory; reads need none, as files are only ever replaced whole.
+STORE_ROOT = Path(os.environ.get("AXELAR_STORE_DIR", ".store"))
+
+
+ONE_DAY = pd.Timedelta(days=1)
+
+
+def _day(value):
+    return pd.Timestamp(value).normalize()
+
+
+def _runs_missing(runs, start, end):
+    """The runs of days in [start, end] that `runs` does not cover."""
+    missing, cursor = [], start
+    for first, last in runs:
+        if last < cursor:
+            continue
+        if first > end:
+            break
+        if first > cursor:
+            missing.append((cursor, first - ONE_DAY))
+        cursor = last + ONE_DAY
+    if cursor <= end:
+        missing.append((cursor, end))
+    return missing
+
+
+def _runs_add(runs, *added):
+    """`runs` plus the `added` runs, merged into sorted, non-adjacent runs."""
+    merged = []
+    for first, last in sorted([*runs, *added]):
+        if merged and first <= merged[-1][1] + ONE_DAY:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+        else:
+            merged.append((first, last))
+    return merged
+
+
+class DailyStore:
+    def __init__(self, name, fetch_days, tables, finalize_days=2, tail_ttl=600, version=1, root=STORE_ROOT):
+        self.path = Path(root) / name
+        self.fetch_days = fetch_days
+        self.tables = {table: dict(schema) for table, schema in tables.items()}
+        self.finalize_days = finalize_days
+        self.tail_ttl = tail_ttl
+        self.version = version
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._codes = {}
+        self._codes_lock = threading.Lock()
+
+    def codes(self, name):
+        """The CodeDictionary `name` stored alongside this store's partitions."""
+        with self._codes_lock:
+            if name not in self._codes:
+                self._codes[name] = CodeDictionary(self.path / f"_codes_{name}.json")
+            return self._codes[name]
+
+    def _locked(self):
+        # The lock file sits beside the store directory, so a reset that removes the directory keeps holding it.
+        return file_lock(self.path.parent / f".{self.path.name}.lock", self._lock)
+
+    def _reset(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+        with self._codes_lock:
+            self._codes.clear()
+
+    # --- Metadata ----------------------------------------------------------------------------------------------
+    def _meta_path(self):
+        return self.path / "_meta.json"
+
+    def _read_meta(self):
+        # An outdated store reads as empty and is flagged; it is only reset under the lock.
+        if not self._meta_path().exists():
+            return {"covered": [], "final": [], "tail_refreshed_at": 0.0}
+        meta = json.loads(self._meta_path().read_text())
+        if meta.get("version", 1) != self.version:
+            return {
+                "covered": [], "final": [], "tail_refreshed_at": 0.0,
+                "generation": meta.get("generation", 0), "outdated": True,  # generations keep counting up
+            }
+        if "first_day" in meta:  # stores written before runs kept one contiguous range
+            first, final = meta.pop("first_day"), meta.pop("finalized_through")
+            meta["covered"] = [[first, meta.pop("covered_through")]]
+            meta["final"] = [[first, final]] if final >= first else []
+        for key in ("covered", "final"):
+            meta[key] = [(_day(first), _day(last)) for first, last in meta[key]]
+        return meta
+
+    def _write_meta(self, meta):
+        meta["generation"] = meta.get("generation", 0) + 1
+        out = dict(meta, version=self.version)
+        for key in ("covered", "final"):
+            out[key] = [[first.strftime("%Y-%m-%d"), last.strftime("%Y-%m-%d")] for first, last in meta[key]]
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = self._meta_path().with_suffix(".tmp")
+        tmp.write_text(json.dumps(out))
+        tmp.replace(self._meta_path())
+
+    def generation(self):
+        """A counter bumped whenever stored days change, to key anything computed from what was read."""
+        return self._read_meta().get("generation", 0)
+
+    def _tail(self, meta):
+        """Covered days that are not final yet, as runs."""
+        return [run for first, last in meta["covered"] for run in _runs_missing(meta["final"], first, last)]
+
+    # --- Partitions --------------------------------------------------------------------------------------------
+    def _partition(self, table, month):
+        return self.path / table / f"month={month}.parquet"
+
+    def _months(self, start, end):
+        return pd.period_range(start, end, freq="M").strftime("%Y-%m")
+
+    def _write_days(self, table, df, start, end):
+        (self.path / table).mkdir(parents=True, exist_ok=True)
+        for month in self._months(start, end):
+            part = self._partition(table, month)
+            new = df[df["day"].dt.strftime("%Y-%m") == month]
+            if part.exists():
+                old = pd.read_parquet(part)
+                old = old[(old["day"] < start) | (old["day"] > end)]
+                new = pd.concat([old, new], ignore_index=True)
+            tmp = part.with_suffix(".tmp")
+            new.sort_values("day", kind="stable").to_parquet(tmp, index=False)
+            tmp.replace(part)
+
+    def _write_tables(self, tables, start, end):
+        for table, df in tables.items():
+            df["day"] = pd.to_datetime(df["day"]).dt.normalize()
+            self._write_days(table, df, start, end)
+
+    def _mark(self, meta, start, end, cutoff):
+        meta["covered"] = _runs_add(meta["covered"], (start, end))
+        if start <= cutoff:
+            meta["final"] = _runs_add(meta["final"], (start, min(end, cutoff)))
+
+    # --- Refresh -----------------------------------------------------------------------------------------------
+    def _cutoff(self):
+        return _day(pd.Timestamp.now()) - pd.Timedelta(days=self.finalize_days)
+
+    def _refresh_tail(self, pool, runs):
+        # Pulled outside the lock so readers and other ranges are not held up; only the swap-in is serialized.
+        try:
+            if time.time() - self._read_meta()["tail_refreshed_at"] < self.tail_ttl:
+                return  # another process has refreshed it meanwhile
+            cutoff = self._cutoff()
+            pulled = [(first, last, self.fetch_days(pool, first, last)) for first, last in runs]
+            with self._locked():
+                meta = self._read_meta()
+                if meta.get("outdated"):
+                    return
+                for first, last, tables in pulled:
+                    self._write_tables(tables, first, last)
+                    self._mark(meta, first, last, cutoff)
+                meta["tail_refreshed_at"] = time.time()
+                self._write_meta(meta)
+        finally:
+            self._refreshing = False
+
+    def ensure(self, pool, start_date, end_date):
+        """Fetch the days of [start_date, end_date] the store lacks; a stale tail is refreshed in the background.
+
+        Returns whether any days had to be fetched before the range could be served."""
+        today = _day(pd.Timestamp.now())
+        cutoff = self._cutoff()
+        start, end = _day(start_date), min(_day(end_date), today)
+        if start > end:
+            return False
+        with self._locked():
+            meta = self._read_meta()
+            if meta.pop("outdated", False):
+                self._reset()
+            tail = self._tail(meta)
+            missing = _runs_missing(meta["covered"], start, end)
+            for first, last in missing:
+                self._write_tables(self.fetch_days(pool, first, last), first, last)
+                self._mark(meta, first, last, cutoff)
+            if missing:
+                if not tail:  # the new days are the whole tail, and they are fresh
+                    meta["tail_refreshed_at"] = time.time()
+                self._write_meta(meta)
+
+            tail_stale = time.time() - meta["tail_refreshed_at"] >= self.tail_ttl
+            tail_requested = any(first <= end and last >= start for first, last in self._tail(meta))
+            if not (tail_stale and tail_requested) or self._refreshing:
+                return bool(missing)
+            self._refreshing = True
+        threading.Thread(target=self._refresh_tail, args=(pool, self._tail(meta)), daemon=True).start()
+        return bool(missing)
+
+    def read(self, table, start_date, end_date, columns=None):
+        start, end = _day(start_date), _day(end_date)
+        columns = columns or list(self.tables[table])
+        if "day" not in columns:
+            columns = ["day"] + list(columns)
+        parts = [self._partition(table, m) for m in self._months(start, end)]
+        frames = [pd.read_parquet(p, columns=columns) for p in parts if p.exists()]
+        if not frames:
+            schema = self.tables[table]
+            return pd.DataFrame({column: pd.Series(dtype=schema[column]) for column in columns})
+        df = pd.concat(frames, ignore_index=True)
+        return df[(df["day"] >= start) & (df["day"] <= end)].reset_index(drop=True)
+
+    def load(self, pool, table, start_date, end_date, columns=None):
+        self.ensure(pool, start_date, end_date)
+        return self.read(table, start_date, end_date, columns)
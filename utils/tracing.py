@@ -0,0 +1,157 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# --- Load Tracing ----------------------------------------------------------------------------------------------
+# Every loader, query and render span appends one event to a process-wide ring buffer, tagged with the viewer's
+# session and the loader it ran under. Queries are named after their registry template and carry its text hash
+# (query_key), whether the shared result cache served them, the warehouse query id, execute (submit + first
+# result) and fetch (transfer + Arrow -> pandas) times, rows and in-memory bytes; store-backed loaders record
+# whether the daily store already held their whole range (cache_hit) or had to fetch days from the warehouse
+# first. Compile/execution time and bytes scanned come from QUERY_HISTORY on demand in the
+# admin panel, so tracing itself never adds warehouse work.
+MAX_EVENTS = 5000
+EVENT_COLUMNS = [
+    "ts", "session", "kind", "name", "loader", "wall_s", "cache_hit",
+    "query_key", "query_id", "execute_s", "fetch_s", "rows", "bytes", "error",
+]
+_local = threading.local()
+
+
+@st.cache_resource
+def get_trace_log():
+    return {"events": deque(maxlen=MAX_EVENTS), "lock": threading.Lock()}
+
+
+def _session_id():
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
+
+def record(kind, name, **fields):
+    event = {"ts": time.time(), "session": _session_id(), "kind": kind, "name": name,
+             "loader": getattr(_local, "loader", None), **fields}
+    log = get_trace_log()
+    with log["lock"]:
+        log["events"].append(event)
+    return event
+
+
+def events(session=None):
+    log = get_trace_log()
+    with log["lock"]:
+        rows = list(log["events"])
+    if session is not None:
+        rows = [e for e in rows if e["session"] == session]
+    return pd.DataFrame(rows, columns=EVENT_COLUMNS)
+
+
+@contextmanager
+def span(kind, name, **fields):
+    """Time the block and record it; `fields` can be updated inside the block before it is recorded."""
+    start = time.perf_counter()
+    fields.setdefault("error", None)
+    try:
+        yield fields
+    except Exception as err:
+        fields["error"] = repr(err)
+        raise
+    finally:
+        record(kind, name, wall_s=time.perf_counter() - start, **fields)
+
+
+# --- Loader Decorators -----------------------------------------------------------------------------------------
+# Loaders are the page-facing data functions, transforms the local pandas rollups. Code running inside one can
+# fill in fields of its span with `annotate`.
+def _run_as(name, fn, args, kwargs, fields=None):
+    outer, outer_fields = getattr(_local, "loader", None), getattr(_local, "fields", None)
+    _local.loader, _local.fields = name, fields
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _local.loader, _local.fields = outer, outer_fields
+
+
+def annotate(**fields):
+    """Set `fields` on the span of the traced function currently running on this thread, if any."""
+    current = getattr(_local, "fields", None)
+    if current is not None:
+        current.update(fields)
+
+
+def traced(kind):
+    """Record every call of the decorated function as a `kind` span; queries inside it are attributed to it."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            with span(kind, fn.__name__, cache_hit=None) as fields:
+                return _run_as(fn.__name__, fn, args, kwargs, fields)
+        return run
+    return decorate
+
+
+traced_loader = traced("loader")
+
+
+# --- Warehouse Stats -------------------------------------------------------------------------------------------
+def build_query_history_query(query_ids):
+    ids = ", ".join(f"'{query_id}'" for query_id in query_ids)
+    return f"""
+    SELECT query_id, compilation_time / 1000 AS compile_s, execution_time / 1000 AS warehouse_execute_s,
+           queued_overload_time / 1000 AS queued_s, bytes_scanned, percentage_scanned_from_cache, rows_produced
+    FROM TABLE(INFORMATION_SCHEMA.QUERY_HISTORY_BY_USER(RESULT_LIMIT => 10000))
+    WHERE query_id IN ({ids})
+    """
+
+
+def warehouse_stats(pool, query_ids):
+    # Goes straight to the pool rather than through run_query so looking at the trace does not add to it.
+    df = pool.query(build_query_history_query(query_ids))
+    df.columns = df.columns.str.lower()
+    return df
+
+
+# --- Admin Panel -----------------------------------------------------------------------------------------------
+# Shown in the sidebar when AXELAR_ADMIN=1 or the page is opened with ?admin=1.
+def admin_enabled():
+    return os.environ.get("AXELAR_ADMIN") == "1" or st.query_params.get("admin") == "1"
+
+
+def to_jsonl(df):
+    return "\n".join(json.dumps(row, default=str) for row in df.to_dict(orient="records"))
+
+
+def show_admin_panel(pool):
+    if not admin_enabled():
+        return
+    with st.sidebar.expander("🛠️ Load trace", expanded=False):
+        all_sessions = st.checkbox("All sessions", value=False)
+        df = events(None if all_sessions else _session_id())
+        if df.empty:
+            st.caption("No events recorded yet.")
+            return
+        df = df.assign(ts=pd.to_datetime(df["ts"], unit="s"))
+        summary = df.groupby(["kind", "name"], sort=False).agg(
+            calls=("wall_s", "size"), total_s=("wall_s", "sum"), max_s=("wall_s", "max"),
+            cache_hits=("cache_hit", lambda s: int(s.fillna(False).astype(bool).sum())),
+        ).reset_index().sort_values("total_s", ascending=False)
+        st.dataframe(summary, hide_index=True)
+        st.dataframe(df.drop(columns=["session"]).iloc[::-1], hide_index=True, height=250)
+
+        query_ids = df["query_id"].dropna().unique().tolist()
+        if query_ids and st.button("Fetch warehouse stats"):
+            try:
+                st.dataframe(warehouse_stats(pool, query_ids), hide_index=True)
+            except Exception as err:
+                st.warning(f"QUERY_HISTORY lookup failed: {err}")
+
+        st.download_button("Export JSON lines", to_jsonl(df), file_name="axelar_trace.jsonl",
+                           mime="application/x-ndjson")